@@ -17,15 +17,19 @@ import atexit
 import re
 import traceback
 import logging
+import logging.handlers
+import queue
 import os
 import socket
+import select
 import time
 import hashlib
-from datetime import datetime
 import argparse
+from collections import deque
+import numpy as np
 
 # Version (as presented to server)
-CLIVER = "0.3"
+CLIVER = "0.4"
 
 # Exit codes
 EXIT_OK = 0         # All is well
@@ -43,6 +47,11 @@ CNFKEY_TIMO = ['t', 'timeout', 300]  # Time in ms between snake moves
 CNFKEY_PORT = ['P', 'port', 0]       # Server port
 CNFKEY_HOST = ['H', 'host', '']      # Server host
 CNFKEY_USER = ['u', 'user', '']      # User's nickname
+CNFKEYS = (CNFKEY_ROWS, CNFKEY_COLS, CNFKEY_SLEN, CNFKEY_TIMO,
+           CNFKEY_PORT, CNFKEY_HOST, CNFKEY_USER)
+
+# Configuration file line: key, a colon, one blank and the value
+CNFLINE = re.compile(r'^([a-z]+): ([a-zA-Z0-9].*)')
 
 # Maximum allowed length of user name (-u)
 USERML = 16
@@ -58,12 +67,13 @@ def errprint(*args, **kargs):
 
 class Display:
     """Set up and restore the entire display."""
-    graphics_active = False     # Graphics initialized?
+    __slots__ = ('rows', 'cols', 'timo', 'win', 'graphics_active')
 
     def __init__(self, rows, cols, timo=0):
         self.rows = rows
         self.cols = cols
         self.timo = timo
+        self.graphics_active = False    # Graphics initialized?
         self.win = self.graphact(rows, cols, timo)
 
     def getwin(self):
@@ -143,96 +153,115 @@ class Playground:
     OBJ_BOMB = 4    # When the snake/Worm hits it, it's killed
     OBJ_CLEAR = 8   # This position should be cleaned visibly, and reset
     OBJ_SNAKE = 16  # There's a snake (head or body) here
+    OBJ_BUSY = OBJ_FOOD | OBJ_BOMB | OBJ_SNAKE  # Nothing more may go here
+    __slots__ = ('server', 'reporting', 'rows', 'cols', 'timo', 'pgr',
+                 'display', 'win', 'postoclean', 'reports', 'inner')
 
     def __init__(self, cnf, server=None):
         self.server = server
+        # Report events only if actually connected, see Server.use
+        self.reporting = bool(server and server.use)
         self.rows = cnf.getconf(CNFKEY_ROWS[1])
         self.cols = cnf.getconf(CNFKEY_COLS[1])
         self.timo = cnf.getconf(CNFKEY_TIMO[1])
-        self.pgr = [[self.OBJ_EMPTY for _ in range(self.cols)]
-                    for _ in range(self.rows)]
+        self.pgr = np.zeros((self.rows, self.cols), dtype=np.uint8)
         self.display = Display(self.rows, self.cols, self.timo)
         self.win = self.display.getwin()
-        self.postoclean = []    # Positions needed to be cleaned
+        self.postoclean = None  # Position needed to be cleaned
+        self.reports = []       # Events not yet sent to server
         # Mark borders
-        # horizontal borders
-        for _ in range(self.cols):
-            self.pgr[0][_] = self.OBJ_BORDER
-            self.pgr[self.rows - 1][_] = self.OBJ_BORDER
-        # vertical borders
-        for _ in range(self.rows):
-            self.pgr[_][0] = self.OBJ_BORDER
-            self.pgr[_][self.cols - 1] = self.OBJ_BORDER
+        self.pgr[0, :] = self.pgr[-1, :] = self.OBJ_BORDER
+        self.pgr[:, 0] = self.pgr[:, -1] = self.OBJ_BORDER
+        # Inside of the borders, a view sharing memory with pgr
+        self.inner = self.pgr[1:-1, 1:-1]
+        # Borders never change, so they are drawn once
+        self.win.border(curses.ACS_VLINE)
 
     def __report(self, text):
-        """Report event to server, if connected."""
-        if not self.server:
+        """Queue event for the server.
+        Callers check self.reporting first, to avoid building the text
+        when not connected. Queued events are sent by flushreports().
+        """
+        self.reports.append(text)
+
+    def flushreports(self):
+        """Send all queued events to the server as one message.
+        Each event is terminated by LF.
+        """
+        if not self.reports:
             return
-        self.server.send(text.encode())
-        self.server.recv(MSGSIZE)
+        self.server.send(("\n".join(self.reports) + "\n").encode())
+        self.server.dropacks()
+        self.reports.clear()
+
+    def __pickempty(self):
+        """Return [row, col] of a random free position inside the borders,
+        or None if the playground is full.
+        """
+        empty = np.flatnonzero((self.inner & self.OBJ_BUSY) == 0)
+        if 0 == empty.size:
+            return None
+        row, col = divmod(int(empty[random.randrange(empty.size)]),
+                          self.cols - 2)
+        return [row + 1, col + 1]
+
+    def __place(self, what, vis):
+        """Mark and draw an object (OBJ_-mnemonic) at a random free position.
+        Returns the [row, col] used, or None if the playground is full.
+        """
+        pos = self.__pickempty()
+        if pos is not None:
+            self.markpos(pos[0], pos[1], what)
+            self.win.addch(pos[0], pos[1], vis)
+        return pos
 
     def feed(self):
         """Place food at random coordinate."""
-        while True:
-            foodpos = [random.randint(1, self.rows - 2),
-                       random.randint(1, self.cols - 2)]
-            cell = self.atpos(foodpos[0], foodpos[1])
-            if self.OBJ_EMPTY == (cell &
-               (self.OBJ_FOOD | self.OBJ_BOMB | self.OBJ_SNAKE)):
-                break
-        logging.debug('feed %s, %s, %s',
-                      str(foodpos[0]), str(foodpos[1]), str(cell))
-        self.markpos(foodpos[0], foodpos[1], self.OBJ_FOOD)
-        self.win.addch(foodpos[0], foodpos[1], self.VIS_FOOD)
-        self.win.addstr(0, 2, "  Food: " + str(int(foodpos[0]))
-                        + " " + str(int(foodpos[1])) + "  ")
-        self.win.refresh()
+        foodpos = self.__place(self.OBJ_FOOD, self.VIS_FOOD)
+        if foodpos is None:
+            return
+        logging.debug('feed %d, %d', foodpos[0], foodpos[1])
+        self.win.addstr(0, 2, f"  Food: {foodpos[0]} {foodpos[1]}  ")
 
     def bomb(self):
         """Place bomb at random coordinate."""
-        while True:
-            bombpos = [random.randint(1, self.rows - 2),
-                       random.randint(1, self.cols - 2)]
-            cell = self.atpos(bombpos[0], bombpos[1])
-            if self.OBJ_EMPTY == (cell &
-               (self.OBJ_FOOD | self.OBJ_BOMB | self.OBJ_SNAKE)):
-                break
-        self.markpos(bombpos[0], bombpos[1], self.OBJ_BOMB)
-        self.win.addch(bombpos[0], bombpos[1], self.VIS_BOMB)
-        self.win.refresh()
+        self.__place(self.OBJ_BOMB, self.VIS_BOMB)
 
     def setcleanpos(self, pos):
-        """Save coordinates for a position that needs to be cleaned."""
-        self.postoclean.insert(0, pos)
+        """Save coordinates for a position that needs to be cleaned.
+        A snake retires at most one tail position per step, and the
+        Playground is cleaned every step, so only one position is kept.
+        """
+        self.postoclean = pos
 
     def cleanpos(self, need_refresh=False):
         """Visibly clean up the Playground."""
-        # Blank positions that were marked by call to setcleanpos()
-        for _ in range(0, len(self.postoclean)):
-            self.win.addch(int(self.postoclean[_][0]),
-                           int(self.postoclean[_][1]),
+        # Blank position that was marked by call to setcleanpos()
+        if self.postoclean is not None:
+            self.win.addch(self.postoclean[0], self.postoclean[1],
                            self.VIS_CLEANER)
+            self.postoclean = None
         if need_refresh:
-            self.win.refresh()
+            self.win.noutrefresh()
 
     def atpos(self, row, col):
         """Return what is at the given position, an OBJ_-mnemonic."""
-        return self.pgr[int(row)][int(col)]
+        return self.pgr.item(row, col)
 
-    def markpos(self, row, col, what=OBJ_EMPTY) -> int:
+    def markpos(self, row, col, what=OBJ_EMPTY, was=None) -> int:
         """Mark this playground position as occupied by something
         indicated by what, which must be an OBJ_-mnemonic.
         If what is OBJ_EMPTY, all marks are reset at this position.
+        A caller that has just read the position may pass it as was,
+        to save reading it again.
         Returns previous value.
         """
-        was = self.atpos(int(row), int(col))
-        self.pgr[int(row)][int(col)] |= what
-        if self.OBJ_EMPTY == what:
-            self.pgr[int(row)][int(col)] = self.OBJ_EMPTY
-        logging.debug('mark %s, %s, %s',
-                      str(int(row)), str(int(col)), str(what))
-        self.__report("G>MRK,ROW:" + str(int(row)) + ",COL:" + str(int(col))
-                      + ",WAT:" + str(what))
+        if was is None:
+            was = self.atpos(row, col)
+        self.pgr[row, col] = was | what if what else self.OBJ_EMPTY
+        logging.debug('mark %d, %d, %d', row, col, what)
+        if self.reporting:
+            self.__report(f"G>MRK,ROW:{row},COL:{col},WAT:{what}")
         return was
 
     def unmarkpos(self, row, col, what) -> int:
@@ -240,18 +269,19 @@ class Playground:
         Mark shall be an OBJ_-menmonic (set by markpos()).
         Returns previous value.
         """
-        was = self.atpos(int(row), int(col))
-        self.pgr[int(row)][int(col)] &= ~what
-        logging.debug('umrk %s, %s, %s',
-                      str(int(row)), str(int(col)), str(what))
-        self.__report("G>UNM,ROW:" + str(int(row)) + ",COL:" + str(int(col))
-                      + ",WAT:" + str(what))
+        was = self.atpos(row, col)
+        self.pgr[row, col] = was & ~what
+        logging.debug('umrk %d, %d, %d', row, col, what)
+        if self.reporting:
+            self.__report(f"G>UNM,ROW:{row},COL:{col},WAT:{what}")
         return was
 
     def draw(self):
-        """Draw the playground."""
-        self.win.border(curses.ACS_VLINE)
-        self.win.refresh()
+        """Draw the playground.
+        The borders are drawn by __init__() and objects when they are
+        placed, so this only queues the window for the next update.
+        """
+        self.win.noutrefresh()
 
     def keypause(self):
         """Deactivate keyboard timeout and wait for keypress."""
@@ -261,6 +291,9 @@ class Playground:
 
 class Worm:
     """A Snake/Worm that crawls across the Playground."""
+    __slots__ = ('pgr', 'cnf', 'slen', 'length', 'curlen', 'rowstep',
+                 'colstep', 'headrow', 'headcol', 'poss', 'score', 'fail',
+                 'neck')
     # Movement directions
     STEP_UP = -1            # Row movement direction - up
     STEP_DOWN = 1           # Row movement direction - down
@@ -278,93 +311,113 @@ class Worm:
     FAIL_HITRIGHT = 4       # Hit right border
     FAIL_HITSNAKE = 5       # Hit a snake
     FAIL_HITBOMB = 6        # Hit a bomb
-    # Fail texts
-    FAILTEXT = {
-        FAIL_NONE:     "Success",
-        FAIL_HITHIGH:  "Hit top border",
-        FAIL_HITLOW:   "Hit lower border",
-        FAIL_HITLEFT:  "Hit left border",
-        FAIL_HITRIGHT: "Hit right border",
-        FAIL_HITSNAKE: "Hit a snake",
-        FAIL_HITBOMB:  "Hit a bomb"
+    # Fail texts, indexed by FAIL_-mnemonic
+    FAILTEXT = (
+        "Success",              # FAIL_NONE
+        "Hit top border",       # FAIL_HITHIGH
+        "Hit lower border",     # FAIL_HITLOW
+        "Hit left border",      # FAIL_HITLEFT
+        "Hit right border",     # FAIL_HITRIGHT
+        "Hit a snake",          # FAIL_HITSNAKE
+        "Hit a bomb"            # FAIL_HITBOMB
+    )
+    # Steering keys and the (rstep, cstep) they turn the snake to
+    KEYMAP = {
+        curses.KEY_DOWN:  (STEP_DOWN, STEP_IDLE),
+        curses.KEY_UP:    (STEP_UP, STEP_IDLE),
+        curses.KEY_LEFT:  (STEP_IDLE, STEP_LEFT),
+        curses.KEY_RIGHT: (STEP_IDLE, STEP_RIGHT)
     }
 
     def __init__(self, playground, cnf,
                  row=None, col=None, rstep=None, cstep=None):
         self.pgr = playground   # Current playground
         self.cnf = cnf          # Configuration
-        self.length = cnf.getconf(CNFKEY_SLEN[1])    # Expected length
+        self.slen = cnf.getconf(CNFKEY_SLEN[1])  # Growth per food
+        self.length = self.slen  # Expected length
         self.curlen = 1         # Current length including head
         # Set initial moving direction
         self.rowstep = rstep if rstep is not None else self.STEP_IDLE
         self.colstep = cstep if cstep is not None else self.STEP_IDLE
         # Set initial head position
-        self.poss = [[row if row is not None else self.pgr.rows / 2,
-                      col if col is not None else self.pgr.cols / 2]]
+        self.headrow = row if row is not None else self.pgr.rows // 2
+        self.headcol = col if col is not None else self.pgr.cols // 2
+        # Positions, head first, packed into one int: row * cols + col
+        self.poss = deque([self.headrow * self.pgr.cols + self.headcol])
+        # The start position is part of the snake, like every later one
+        self.pgr.markpos(self.headrow, self.headcol, self.pgr.OBJ_SNAKE)
         self.score = 0              # Score counter
         self.fail = self.FAIL_NONE  # Reason for Game Over
+        self.neck = None            # Previous head, not yet drawn as body
 
     def __inclen(self):
         """Increment length of snake."""
-        self.length += self.cnf.getconf(CNFKEY_SLEN[1])
+        self.length += self.slen
 
     def draw(self):
-        """Draw the Snake visually."""
+        """Draw the Snake visually.
+        Only the cells that changed since last call are written: the
+        retired tail is cleaned, the new head is drawn and the previous
+        head (saved by __step()) becomes body. The rest of the snake is
+        already on screen.
+        """
         self.pgr.cleanpos(False)
         # Head
-        self.pgr.win.addch(int(self.poss[0][0]),
-                           int(self.poss[0][1]),
-                           self.HEAD)
-        # Tail
-        for _ in range(1, len(self.poss)):
-            self.pgr.win.addch(int(self.poss[_][0]),
-                               int(self.poss[_][1]), self.BODY)
-        self.pgr.win.refresh()
+        self.pgr.win.addch(self.headrow, self.headcol, self.HEAD)
+        # Previous head, unless it was retired as tail
+        if self.neck is not None and len(self.poss) > 1:
+            self.pgr.win.addch(*divmod(self.neck, self.pgr.cols), self.BODY)
+        self.neck = None
+        self.pgr.win.noutrefresh()
+
+    def __hitborder(self, row, col):
+        """Return the FAIL_-mnemonic for the border at row, col."""
+        if row < 1:
+            return self.FAIL_HITHIGH
+        if col < 1:
+            return self.FAIL_HITLEFT
+        if row >= self.pgr.rows - 1:
+            return self.FAIL_HITLOW
+        return self.FAIL_HITRIGHT
 
     def __step(self):
         """Move the Snake in current direction."""
         needfood = False
-        if self.STEP_IDLE == self.rowstep and self.STEP_IDLE == self.colstep:
+        if not (self.rowstep or self.colstep):
             # Snake is sleeping
             return self.FAIL_NONE
+        pgr = self.pgr
         # Calculate next position for snake's head
-        newhead = [self.poss[0][0] + self.rowstep,
-                   self.poss[0][1] + self.colstep]
+        row = self.headrow + self.rowstep
+        col = self.headcol + self.colstep
         # Find out what's at the new position
-        cell = self.pgr.atpos(newhead[0], newhead[1])
+        cell = pgr.atpos(row, col)
         if cell:
-            self.pgr.win.refresh()
-        if cell & self.pgr.OBJ_SNAKE:
-            return self.FAIL_HITSNAKE
-        if cell & self.pgr.OBJ_BOMB:
-            return self.FAIL_HITBOMB
-        if cell & self.pgr.OBJ_FOOD:
-            logging.debug('step %s, %s',
-                          str(int(newhead[0])), str(int(newhead[1])))
-            self.pgr.unmarkpos(newhead[0], newhead[1], self.pgr.OBJ_FOOD)
-            needfood = True
-            self.__inclen()
-        self.pgr.markpos(newhead[0], newhead[1], self.pgr.OBJ_SNAKE)
+            # Usually empty, so only a marked cell is examined further
+            if cell & pgr.OBJ_BORDER:
+                return self.__hitborder(row, col)
+            if cell & pgr.OBJ_SNAKE:
+                return self.FAIL_HITSNAKE
+            if cell & pgr.OBJ_BOMB:
+                return self.FAIL_HITBOMB
+            if cell & pgr.OBJ_FOOD:
+                logging.debug('step %d, %d', row, col)
+                pgr.unmarkpos(row, col, pgr.OBJ_FOOD)
+                cell &= ~pgr.OBJ_FOOD
+                needfood = True
+                self.__inclen()
+        pgr.markpos(row, col, pgr.OBJ_SNAKE, cell)
         if needfood:
-            self.pgr.feed()
-        self.poss.insert(0, newhead)
-        if len(self.poss) > self.length:
-            last = len(self.poss) - 1
-            self.pgr.setcleanpos(self.poss[last])
-            self.pgr.unmarkpos(self.poss[last][0],
-                               self.poss[last][1],
-                               self.pgr.OBJ_SNAKE)
-            self.poss.pop(last)
-        # Check that snake is still inside the playground.
-        # Actually we can also check if (cell & self.pgr.BORDER)
-        if self.poss[0][0] < 1:     # Hit top
-            return self.FAIL_HITHIGH
-        if self.poss[0][1] < 1:     # Hit left
-            return self.FAIL_HITLEFT
-        if self.poss[0][0] >= self.pgr.rows - 1:    # Hit bottom
-            return self.FAIL_HITLOW
-        if self.poss[0][1] >= self.pgr.cols - 1:    # Hit right
-            return self.FAIL_HITRIGHT
+            pgr.feed()
+        poss = self.poss
+        self.neck = poss[0]
+        poss.appendleft(row * pgr.cols + col)
+        self.headrow = row
+        self.headcol = col
+        if len(poss) > self.length:
+            tailrow, tailcol = divmod(poss.pop(), pgr.cols)
+            pgr.setcleanpos([tailrow, tailcol])
+            pgr.unmarkpos(tailrow, tailcol, pgr.OBJ_SNAKE)
         return self.FAIL_NONE
 
     def turn(self, rstep=None, cstep=None):
@@ -386,37 +439,57 @@ class Worm:
         With parameter, requested code is converted to text.
         """
         if -1 == fail:
-            return self.FAILTEXT[self.fail]
-        try:
+            fail = self.fail
+        if 0 <= fail < len(self.FAILTEXT):
             return self.FAILTEXT[fail]
-        except KeyError:
-            errprint("Program error - illegal index (" + str(fail) + ")")
-            line = traceback.format_stack()[0]
-            errprint(line.strip())
-            sys.exit(EXIT_PROG)
+        errprint("Program error - illegal index (" + str(fail) + ")")
+        line = traceback.format_list(traceback.extract_stack(limit=2))[0]
+        errprint(line.strip())
+        sys.exit(EXIT_PROG)
 
     def play(self):
-        """ Main loop. Returns failure as FAIL_-mnemonic """
+        """ Main loop. Returns failure as FAIL_-mnemonic.
+        The snake steps at fixed deadlines, one timeout apart. Keys only
+        change direction and never make the snake step earlier.
+        """
+        # Local names for what the loop uses on every turn
+        win = self.pgr.win
+        keymap = self.KEYMAP
+        clock = time.monotonic_ns
+        doupdate = curses.doupdate
+        step = self.__step
+        flushreports = self.pgr.flushreports
+        period = self.pgr.timo * 1000000    # Time between steps in ns
+        deadline = clock() + period
+        # Show everything drawn before play started
+        doupdate()
         while self.FAIL_NONE == self.fail:
-            key = self.pgr.win.getch()
-            match key:
-                case curses.KEY_DOWN:
-                    self.turn(self.STEP_DOWN)
-                case curses.KEY_LEFT:
-                    self.turn(None, self.STEP_LEFT)
-                case curses.KEY_RIGHT:
-                    self.turn(None, self.STEP_RIGHT)
-                case curses.KEY_UP:
-                    self.turn(self.STEP_UP)
-            self.fail = self.__step()
+            # Wait for a key, but not beyond the next step. Round the
+            # wait up, so it doesn't end just before the deadline.
+            win.timeout(max(-((clock() - deadline) // 1000000), 0))
+            move = keymap.get(win.getch())
+            if move is not None:
+                self.rowstep, self.colstep = move
+            now = clock()
+            if now < deadline:
+                continue
+            deadline += period
+            if deadline < now:
+                # Too far behind, don't try to catch up
+                deadline = now + period
+            self.fail = step()
+            flushreports()
             if not self.fail:
                 self.score += 1
                 self.draw()
+                # One terminal update for everything drawn this step
+                doupdate()
 
         # Show the score
-        score_row = int(self.cnf.getconf(CNFKEY_ROWS[1])) - 1
-        self.pgr.win.addstr(score_row, 2, " Score: " + str(self.score) + " ")
+        score_row = self.pgr.rows - 1
+        self.pgr.win.addstr(score_row, 2, f" Score: {self.score} ")
         self.draw()
+        curses.doupdate()
         return self.fail
 
 
@@ -438,16 +511,12 @@ class Help:
 
 class Config:
     """Configuration of one game instance."""
+    __slots__ = ('conffile', 'cnfvals')
 
     def __init__(self, conffile=None):
         self.conffile = conffile     # Configuration file
-        self.cnfval_rows = CNFKEY_ROWS[2]
-        self.cnfval_cols = CNFKEY_COLS[2]
-        self.cnfval_slen = CNFKEY_SLEN[2]
-        self.cnfval_timo = CNFKEY_TIMO[2]
-        self.cnfval_port = CNFKEY_PORT[2]
-        self.cnfval_host = CNFKEY_HOST[2]
-        self.cnfval_user = CNFKEY_USER[2]
+        # Values by config file key, starting with the defaults
+        self.cnfvals = {cnfkey[1]: cnfkey[2] for cnfkey in CNFKEYS}
         if conffile:
             self.readconf(conffile)
 
@@ -456,9 +525,8 @@ class Config:
         self.conffile = conffile if conffile is not None else "snake.cnf"
 
         try:
-            conff = open(self.conffile)
-            cnf = conff.readlines()
-            conff.close()
+            with open(self.conffile) as conff:
+                cnf = conff.read().splitlines()
         except FileNotFoundError:
             errprint("Non-existing configuration file: " + self.conffile)
             sys.exit(EXIT_ERR)
@@ -469,45 +537,25 @@ class Config:
             errprint("Configuration file is a directory: " + self.conffile)
             sys.exit(EXIT_ERR)
         except Exception as e:
-            logging.debug(f"readconf exception {e}")
+            logging.debug('readconf exception %s', e)
             errprint(f"ERROR: Config file error {e}.")
             sys.exit(EXIT_ERR)
 
-        keyval = re.compile('^[a-z]+: [a-zA-Z0-9]+')
         for _ in cnf:
-            if not keyval.match(_):
+            keyval = CNFLINE.match(_)
+            if not keyval:
                 continue
-            keypos = re.search(r"\s", _).start()
-            key = _[:keypos - 1]
-            val = _[keypos:].strip()
-            self.setconf(key, val)
+            self.setconf(keyval.group(1), keyval.group(2).strip())
 
     def setconf(self, key, val):
-        """Assign configurable value to a key."""
-        try:
-            if CNFKEY_ROWS[1] == key:
-                self.cnfval_rows = int(val)
-                return
-            if CNFKEY_COLS[1] == key:
-                self.cnfval_cols = int(val)
-                return
-            if CNFKEY_SLEN[1] == key:
-                self.cnfval_slen = int(val)
-                return
-            if CNFKEY_TIMO[1] == key:
-                self.cnfval_timo = int(val)
-                return
-            if CNFKEY_PORT[1] == key:
-                self.cnfval_port = int(val)
-                return
-            if CNFKEY_HOST[1] == key:
-                self.cnfval_host = val
-                return
-            if CNFKEY_USER[1] == key:
-                self.cnfval_user = val
-                return
+        """Assign configurable value to a key.
+        The value is converted to the type of the key's default value.
+        """
+        if key not in self.cnfvals:
             errprint(f"Invalid setconf(key=\"{key}\")!")
             sys.exit(EXIT_PROG)
+        try:
+            self.cnfvals[key] = type(self.cnfvals[key])(val)
         except ValueError:
             errprint("Invalid argument or config value!")
             sys.exit(EXIT_SYNTAX)
@@ -516,20 +564,8 @@ class Config:
         """Return a configuration value.
         key -- Configuration parameter name: CNFKEY_...[1]
         """
-        if CNFKEY_ROWS[1] == key:
-            return self.cnfval_rows
-        if CNFKEY_COLS[1] == key:
-            return self.cnfval_cols
-        if CNFKEY_SLEN[1] == key:
-            return self.cnfval_slen
-        if CNFKEY_TIMO[1] == key:
-            return self.cnfval_timo
-        if CNFKEY_PORT[1] == key:
-            return self.cnfval_port
-        if CNFKEY_HOST[1] == key:
-            return self.cnfval_host
-        if CNFKEY_USER[1] == key:
-            return self.cnfval_user
+        if key in self.cnfvals:
+            return self.cnfvals[key]
         errprint("Invalid getconf(key=" + key + ")!")
         sys.exit(EXIT_PROG)
 
@@ -541,6 +577,9 @@ class Server:
     of the values is set, server connection will be silently ignored.
     Connection uses TCP/IP sockets.
     The server must be running.
+    The socket is non-blocking, so sending never waits for the server.
+    The server acknowledges each read, not each message, so its replies
+    tell nothing about what has been received and are just discarded.
     """
 
     def __init__(self, cnf=None):
@@ -563,6 +602,12 @@ class Server:
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
+            # Each message is complete when sent, so don't let Nagle hold it
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock.setblocking(False)
+            # Constant for the whole session
+            self.pid = os.getpid()
+            self.ownhost, self.ownport = self.sock.getsockname()
         except ConnectionRefusedError:
             self.use = False
             errprint("Server " + host + " refuses connection on port "
@@ -571,50 +616,60 @@ class Server:
             sys.exit(EXIT_ERR)
 
     def send(self, data):
-        """Send a sequence to the server if connected."""
+        """Send a sequence to the server if connected.
+        Waits only if the socket's send buffer is full.
+        """
         if not self.use:
             return
-        self.sock.sendall(data)
+        data = memoryview(data)
+        while data:
+            try:
+                data = data[self.sock.send(data):]
+            except BlockingIOError:
+                select.select([], [self.sock], [])
 
     def recv(self, maxlen=1024) -> str:
-        """Receive a string from server if connected."""
+        """Receive a string from server if connected.
+        Returns None if nothing has arrived yet.
+        """
         if not self.use:
             return None
-        ret = self.sock.recv(maxlen).decode()
+        try:
+            ret = self.sock.recv(maxlen).decode()
+        except BlockingIOError:
+            return None
         return ret
 
+    def dropacks(self):
+        """Discard the acknowledgements that have arrived so far."""
+        while self.recv(MSGSIZE):
+            pass
+
     def __srvhead(self, tag, score=None, failcode=None, sig=None):
         """Create and send header to server, if connected."""
         if not self.use:
             return
-        ownport = self.sock.getsockname()[1]
         if "END" == tag:
-            head = 'G>END,SCR:' + str(score) + ',SIG:' + str(sig) + ',FAI:' + \
-                str(failcode)
-            head = head + ',PID:' + str(os.getpid()) + ",PRT:" + str(ownport)
+            head = (f'G>END,SCR:{score},SIG:{sig},FAI:{failcode},'
+                    f'PID:{self.pid},PRT:{self.ownport},')
         elif "BEG" == tag:
-            head = 'G>' + tag + ',VER:' + CLIVER + ',PID:' + str(os.getpid()) \
-                + ",PRT:" + str(ownport)
-            head = head + ',RWS:' + str(self.cnf.getconf(CNFKEY_ROWS[1])) + \
-                ',CLS:' + str(self.cnf.getconf(CNFKEY_COLS[1]))
-            head = head + ',LEN:' + str(self.cnf.getconf(CNFKEY_SLEN[1])) + \
-                ',TIO:' + str(self.cnf.getconf(CNFKEY_TIMO[1]))
+            head = (f'G>BEG,VER:{CLIVER},PID:{self.pid},PRT:{self.ownport},'
+                    f'RWS:{self.cnf.getconf(CNFKEY_ROWS[1])},'
+                    f'CLS:{self.cnf.getconf(CNFKEY_COLS[1])},'
+                    f'LEN:{self.cnf.getconf(CNFKEY_SLEN[1])},'
+                    f'TIO:{self.cnf.getconf(CNFKEY_TIMO[1])},')
         else:
-            head = ('G>' + tag).encode()
-
-        head = head + ',USR:' + self.user
-        head = head + ',HSH:' + self.hash
-        head = head.encode()
+            head = f'G>{tag},'
+        head = f'{head}USR:{self.user},HSH:{self.hash}\n'.encode()
         self.send(head)
-        self.recv(1024)
+        self.dropacks()
 
     def newgame(self):
         """Report start of a new game to the server, if connected."""
         if self.use:
-            hash_ = self.sock.getsockname()[0]
-            hash_ = hash_ + ':' + str(self.sock.getsockname()[1])
-            hash_ = hash_ + ':' + self.user + ':' + str(time.time())
-            self.hash = hashlib.shake_256(hash_.encode()).hexdigest(8)
+            hash_ = f'{self.ownhost}:{self.ownport}:{self.user}:{time.time()}'
+            self.hash = hashlib.blake2b(hash_.encode(),
+                                        digest_size=8).hexdigest()
         self.__srvhead('BEG')
 
     def endgame(self, score, failcode, sig=-1):
@@ -624,6 +679,7 @@ class Server:
     def stop(self):
         """Close connection to server, if connected."""
         if self.use:
+            self.dropacks()
             self.sock.shutdown(socket.SHUT_RDWR)
             self.sock.close()
 
@@ -640,9 +696,8 @@ def exithand():
     _pgr.display.graphact()
 
 
-def sighand(signum, frame):
+def sighand(signum, _frame):
     """Signal handler callback."""
-    del frame
     _pgr.display.graphact()
     errprint("Interrupted")
     _server.trap(signum)
@@ -688,45 +743,28 @@ if __name__ == '__main__':
                 errprint("ERROR: Log file (-L) same as program file!")
                 sys.exit(EXIT_ARGS)
         try:
-            logging.basicConfig(filename=_logfile,
-                                format="%(asctime)s %(levelname)-3.3s "
-                                + "%(message)s",
-                                datefmt='%y%m%d %H:%M:%S',
-                                level=logging.INFO)
+            _loghandler = logging.FileHandler(_logfile)
         except PermissionError:
             errprint(f"ERROR: Can't log to file \"{_logfile}\". "
                      + "Check permissions!")
             sys.exit(EXIT_ERR)
+        _loghandler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)-3.3s %(message)s",
+                              datefmt='%y%m%d %H:%M:%S'))
+        # Let a background thread do the file writes, off the game loop
+        _logqueue = queue.SimpleQueue()
+        _loglistener = logging.handlers.QueueListener(_logqueue, _loghandler)
+        logging.basicConfig(handlers=[
+                                logging.handlers.QueueHandler(_logqueue)],
+                            format="%(message)s", level=logging.INFO)
+        _loglistener.start()
+        atexit.register(_loglistener.stop)
         logging.info('Started')
 
     if args.config:
         # Read configuration from file
         _conf.readconf(args.config)
 
-    if args.rows:
-        # Set number of rows on playground
-        _conf.setconf(CNFKEY_ROWS[1], args.rows)
-
-    if args.cols:
-        # Set number of columns on playground
-        _conf.setconf(CNFKEY_COLS[1], args.cols)
-
-    if args.snakelen:
-        # Set initial snake length
-        _conf.setconf(CNFKEY_SLEN[1], args.snakelen)
-
-    if args.timeout:
-        # Timeout in ms between movements
-        _conf.setconf(CNFKEY_TIMO[1], args.timeout)
-
-    if args.port:
-        # Server port
-        _conf.setconf(CNFKEY_PORT[1], args.port)
-
-    if args.host:
-        # Server host
-        _conf.setconf(CNFKEY_HOST[1], args.host)
-
     if args.user:
         # User's nickname
         if str.isascii(args.user) is not True:
@@ -741,7 +779,11 @@ if __name__ == '__main__':
             errprint(CNFKEY_USER[0]
                      + ": User name must be 1-16 characters in length!")
             sys.exit(EXIT_SYNTAX)
-        _conf.setconf(CNFKEY_USER[1], args.user)
+
+    # Options given on the command line override the configuration file
+    for _cnfkey in CNFKEYS:
+        if getattr(args, _cnfkey[1]):
+            _conf.setconf(_cnfkey[1], getattr(args, _cnfkey[1]))
 
 
 # Connect to server (if requested)
@@ -755,10 +797,8 @@ if __name__ == '__main__':
     atexit.register(exithand)
 
 # Trap signals
-    signal.signal(signal.SIGINT, sighand)
-    signal.signal(signal.SIGHUP, sighand)
-    signal.signal(signal.SIGQUIT, sighand)
-    signal.signal(signal.SIGTERM, sighand)
+    for _sig in (signal.SIGINT, signal.SIGHUP, signal.SIGQUIT, signal.SIGTERM):
+        signal.signal(_sig, sighand)
 
 # Create playground objects
     _pgr.feed()   # First piece of food
@@ -788,7 +828,7 @@ if __name__ == '__main__':
     print("Failure: " + _worm.getfailtext())
 
 # Log result
-    logging.info('Ended. Score %s. Fail %s.',
-                 str(_worm.getscore()), _worm.getfailtext())
+    logging.info('Ended. Score %d. Fail %s.',
+                 _worm.getscore(), _worm.getfailtext())
 
     sys.exit(EXIT_OK)